@@ -5,10 +5,13 @@ MCP server for ScapeGraph API integration.
 This server exposes methods to use ScapeGraph's AI-powered web scraping services:
 - markdownify: Convert any webpage into clean, formatted markdown
 - smartscraper: Extract structured data from any webpage using AI
+- smartscraper_batch: Run several smartscraper extractions concurrently
 - searchscraper: Perform AI-powered web searches with structured results
 - smartcrawler_initiate: Initiate intelligent multi-page web crawling with AI extraction or markdown conversion
 - smartcrawler_fetch_results: Retrieve results from asynchronous crawling operations
+- smartcrawler_await: Wait server-side until a crawling operation completes
 - scrape: Fetch raw page content with optional JavaScript rendering
+- scrape_many: Fetch raw content for several URLs concurrently
 - sitemap: Extract and discover complete website structure
 - agentic_scrapper: Execute complex multi-step web scraping workflows
 
@@ -37,6 +40,7 @@ All tools return errors in a consistent format:
 ### Example Validation Errors:
 - Invalid URL: "website_url must include protocol (http:// or https://)"
 - Range violation: "number_of_scrolls must be between 0 and 50"
+- Size limit: "website_html exceeds 2MB limit"
 - Mutual exclusion: "Cannot specify both website_url and website_html"
 - Missing required: "prompt is required when extraction_mode is 'ai'"
 - Invalid JSON: "output_schema must be valid JSON format"
@@ -52,15 +56,50 @@ For comprehensive parameter documentation, use the resource:
 `scrapegraph://parameters/reference`
 """
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, Optional, List, Union, Annotated
+import random
+import re
+import sys
+from datetime import datetime, timezone
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
+import fastjsonschema
 import httpx
+from cachetools import LRUCache, TTLCache
 from fastmcp import Context, FastMCP
+from fastmcp.server.dependencies import get_http_headers
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from smithery.decorators import smithery
-from pydantic import BaseModel, Field, AliasChoices
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # optional speedup, install with the "speedups" extra
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import xxhash
+except ImportError:  # optional speedup, install with the "speedups" extra
+    xxhash = None  # type: ignore[assignment]
 
 # Configure logging
 logging.basicConfig(
@@ -69,12 +108,368 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and lone surrogates are valid input that
+            # orjson rejects; the stdlib encoder handles them.
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and lone-surrogate escapes are accepted by the stdlib
+            # parser but rejected by orjson; scraped text often contains them.
+            pass
+    return json.loads(data)
+
+
+# Absolute http(s) URL with a non-empty host and no whitespace
+_URL_RE = re.compile(r"^https?://[^\s/$.?#][^\s]*$", re.IGNORECASE)
+
+
+def _validate_url(url: str, param: str) -> None:
+    """
+    Reject URLs the API cannot fetch before making a network call.
+
+    Raises:
+        ValueError: If the URL is not an absolute http:// or https:// URL
+    """
+    if not _URL_RE.match(url):
+        raise ValueError(f"{param} must include protocol (http:// or https://)")
+
+
+# Longest slice of an error body kept for the exception message
+_ERROR_PREVIEW_BYTES = 512
+
+
+class ScrapeGraphError(Exception):
+    """Raised when the ScrapeGraph API answers with a non-200 status."""
+
+    def __init__(self, status: int, body_preview: str):
+        self.status = status
+        self.body_preview = body_preview
+        super().__init__(f"Error {status}: {body_preview}")
+
+
+# Failures a tool reports back to the caller as {"error": ...}: API errors,
+# transport errors and invalid input (JSON decode errors are ValueErrors).
+# httpx.InvalidURL and httpx.StreamError do not subclass httpx.HTTPError, so
+# they are listed explicitly. Anything else is a bug and is left to FastMCP's
+# own error handling.
+_TOOL_ERRORS = (
+    ScrapeGraphError,
+    httpx.HTTPError,
+    httpx.InvalidURL,
+    httpx.StreamError,
+    ValueError,
+)
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """
+    Raise ScrapeGraphError for a non-200 buffered response.
+
+    Only the first _ERROR_PREVIEW_BYTES of the body are decoded, so large HTML
+    error pages don't get materialised as text just to build the message.
+    """
+    if response.status_code != 200:
+        raise ScrapeGraphError(
+            response.status_code,
+            response.content[:_ERROR_PREVIEW_BYTES].decode("utf-8", errors="replace"),
+        )
+
+
+# Transient upstream failures worth retrying. GETs are idempotent, so gateway
+# errors and dropped connections are retried too. A POST is charged once the
+# API processes it, and a 502/504 or a connection dropped mid-response can mean
+# it already was, so POSTs are only retried when the request was refused
+# outright (rate limited, unavailable, or never connected).
+_RETRY_STATUSES = {
+    "GET": frozenset({429, 502, 503, 504}),
+    "POST": frozenset({429, 503}),
+}
+_RETRY_EXCEPTIONS = {
+    "GET": (httpx.ConnectError, httpx.RemoteProtocolError),
+    "POST": (httpx.ConnectError,),
+}
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_DELAY = 8.0
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before the next attempt.
+
+    Honors a numeric Retry-After header, otherwise backs off exponentially with
+    jitter so concurrent callers don't retry in lockstep.
+    """
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+    return min(_MAX_RETRY_DELAY, 0.25 * 2.0 ** attempt) * (0.5 + random.random())
+
+
+# Upper bound the API accepts for inline website_html / website_markdown content
+_MAX_BYTES = 2 * 1024 * 1024
+
+
+def _validate_payload_size(content: str, param: str) -> None:
+    """
+    Reject inline content larger than the API limit before uploading it.
+
+    Raises:
+        ValueError: If the UTF-8 encoded content exceeds _MAX_BYTES
+    """
+    # UTF-8 uses 1-4 bytes per character, so the character count bounds the
+    # encoded size and only borderline inputs need to be encoded.
+    if len(content) * 4 <= _MAX_BYTES:
+        return
+    if len(content) > _MAX_BYTES or len(content.encode("utf-8")) > _MAX_BYTES:
+        raise ValueError(f"{param} exceeds 2MB limit")
+
+
+# Idempotent lookups (sitemap, markdownify, smartscraper) are often repeated
+# within minutes by multi-step workflows and agent retries; keep recent
+# responses for a short while. Keys include the API key so cached data never
+# crosses accounts. Entries are (encoded size, response) pairs and the cache is
+# bounded by total bytes, since markdownify/smartscraper bodies can run to MBs;
+# responses above _CACHE_ENTRY_MAX_BYTES are never cached. Every access is
+# synchronous, so no lock is needed on the event loop.
+_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_CACHE_ENTRY_MAX_BYTES = 1024 * 1024
+_RESPONSE_CACHE: TTLCache = TTLCache(
+    maxsize=_RESPONSE_CACHE_MAX_BYTES, ttl=300, getsizeof=lambda entry: entry[0]
+)
+
+# Requests currently on the wire, so identical concurrent calls share one
+# upstream round trip instead of each issuing their own.
+_INFLIGHT: Dict[tuple, "asyncio.Task[Dict[str, Any]]"] = {}
+
+
+def _canonical_json(obj: Any) -> bytes:
+    """Encode obj as JSON with sorted keys, so equal dicts give equal bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # see _json_dumps
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+
+def _request_digest(payload: Dict[str, Any]) -> bytes:
+    """Content-addressed cache key component for a request payload."""
+    return hashlib.blake2b(_canonical_json(payload), digest_size=16).digest()
+
+
+def _content_digest(content: str) -> str:
+    """Short fingerprint of inline page content, used in place of it in cache keys."""
+    data = content.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+async def _singleflight(
+    key: tuple,
+    fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    join: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run fetch, letting concurrent callers with the same key share a single call.
+
+    Args:
+        key: Key identifying the request
+        fetch: Coroutine factory performing the actual API call
+        join: Whether to join an identical request already on the wire
+
+    Returns:
+        The (possibly shared) response dictionary
+    """
+    if join:
+        inflight = _INFLIGHT.get(key)
+        if inflight is not None:
+            # Shield so one waiter being cancelled doesn't cancel the shared request
+            return await asyncio.shield(inflight)
+
+    task = asyncio.ensure_future(fetch())
+    _INFLIGHT[key] = task
+    try:
+        return await asyncio.shield(task)
+    finally:
+        if _INFLIGHT.get(key) is task:
+            del _INFLIGHT[key]
+
+
+async def _cached_request(
+    key: tuple,
+    fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    no_cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    Serve a response from the cache, join an identical in-flight request, or fetch it.
+
+    Args:
+        key: Cache key identifying the request
+        fetch: Coroutine factory performing the actual API call
+        no_cache: Skip the cache and in-flight lookups and always call the API
+
+    Returns:
+        The (possibly shared) response dictionary
+    """
+    if not no_cache:
+        cached: Optional[Tuple[int, Dict[str, Any]]] = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return cached[1]
+
+    result = await _singleflight(key, fetch, join=not no_cache)
+
+    # Responses reporting an error are returned but not remembered. Re-encoding
+    # for the size costs far less than the API round trip it follows.
+    if not (isinstance(result, dict) and result.get("error")):
+        size = len(_json_dumps(result))
+        if size <= _CACHE_ENTRY_MAX_BYTES:
+            _RESPONSE_CACHE[key] = (size, result)
+    return result
+
+
+# Structural contract for user-supplied output schemas. Checked locally so a
+# malformed schema fails immediately instead of after a long API round trip.
+_OUTPUT_SCHEMA_META: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "type": {
+            "anyOf": [
+                {"type": "string"},
+                {"type": "array", "items": {"type": "string"}},
+            ]
+        },
+        "properties": {
+            "type": "object",
+            "additionalProperties": {"type": "object"},
+        },
+        "items": {"type": ["object", "array"]},
+        "required": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["required"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _output_schema_validator() -> Callable[[Any], Any]:
+    """Compile the output schema contract once and reuse it for every request."""
+    return cast(Callable[[Any], Any], fastjsonschema.compile(_OUTPUT_SCHEMA_META))
+
+
+def _validate_output_schema(output_schema: Dict[str, Any]) -> None:
+    """
+    Check that an output schema is well-formed before sending it to the API.
+
+    Raises:
+        ValueError: If the schema does not satisfy the expected structure
+    """
+    try:
+        _output_schema_validator()(output_schema)
+    except fastjsonschema.JsonSchemaValueException as e:
+        detail = e.message.replace("data", "output_schema", 1)
+        raise ValueError(f"Invalid output_schema: {detail}") from e
+
+
+def _reject_remote_ref(uri: str) -> Any:
+    raise fastjsonschema.JsonSchemaDefinitionException(f"Remote $ref not allowed: {uri}")
+
+
+# fastjsonschema fetches non-local $refs with urlopen by default. Schemas come
+# from callers, so every scheme urllib understands is routed to a rejecter.
+_REF_HANDLERS = {
+    scheme: _reject_remote_ref for scheme in ("http", "https", "ftp", "file", "data")
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_result_validator(schema_key: bytes) -> Optional[Callable[[Any], Any]]:
+    """Compile a validator for a canonical schema encoding, or None if unsupported."""
+    try:
+        # use_default=False: the generated code would otherwise write schema
+        # 'default' values into the (cached, shared) result it is checking.
+        validator = fastjsonschema.compile(
+            _json_loads(schema_key), handlers=_REF_HANDLERS, use_default=False
+        )
+        return cast(Callable[[Any], Any], validator)
+    except Exception:
+        # Remote refs, invalid regex patterns and other definitions
+        # fastjsonschema cannot compile just skip local result validation.
+        return None
+
+
+def _result_validator(output_schema: Dict[str, Any]) -> Optional[Callable[[Any], Any]]:
+    """
+    Return the compiled result validator for an output schema, or None.
+
+    Call this before sending the request: compile problems then surface ahead of
+    the paid API call rather than while handling its result. Validators are
+    cached per distinct schema, so only the first use pays for code generation.
+    """
+    return _compile_result_validator(_canonical_json(output_schema))
+
+
+def _check_result_against_schema(
+    result: Dict[str, Any], validator: Optional[Callable[[Any], Any]]
+) -> None:
+    """
+    Validate an extraction result with a validator from _result_validator.
+
+    A mismatch is reported on the result as 'schema_validation_error' rather
+    than discarding the extracted data.
+    """
+    extracted = result.get("result")
+    if extracted is None or validator is None:
+        return
+    try:
+        validator(extracted)
+    except fastjsonschema.JsonSchemaValueException as e:
+        result["schema_validation_error"] = e.message.replace("data", "result", 1)
+    except Exception:
+        # Generated validators can fail on odd schemas (e.g. a property named
+        # 'price{0}' raises IndexError); skip the check rather than lose the result.
+        pass
+
+
+# Crawl statuses after which polling can stop
+_CRAWL_TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+# Longest a single smartcrawler_await call may hold a tool call open; callers
+# asking for more get the latest status at this point and can call again
+_MAX_AWAIT_SECONDS = 1800.0
+
 
 class ScapeGraphClient:
     """Client for interacting with the ScapeGraph API."""
 
+    __slots__ = ("api_key", "client", "_leases", "_evicted")
+
     BASE_URL = "https://api.scrapegraphai.com/v1"
 
+    # Endpoint URLs are fixed, so build them once instead of on every call
+    _URL_MARKDOWNIFY = BASE_URL + "/markdownify"
+    _URL_SMARTSCRAPER = BASE_URL + "/smartscraper"
+    _URL_SEARCHSCRAPER = BASE_URL + "/searchscraper"
+    _URL_SCRAPE = BASE_URL + "/scrape"
+    _URL_SITEMAP = BASE_URL + "/sitemap"
+    _URL_AGENTIC_SCRAPPER = BASE_URL + "/agentic-scrapper"
+    _URL_CRAWL = BASE_URL + "/crawl"
+    _URL_CRAWL_PREFIX = _URL_CRAWL + "/"
+
     def __init__(self, api_key: str):
         """
         Initialize the ScapeGraph API client.
@@ -83,37 +478,100 @@ class ScapeGraphClient:
             api_key: API key for ScapeGraph API
         """
         self.api_key = api_key
-        self.headers = {
-            "SGAI-APIKEY": api_key,
-            "Content-Type": "application/json"
-        }
-        self.client = httpx.Client(timeout=httpx.Timeout(120.0))
+        # Tool calls currently using this client, and whether the shared cache
+        # has dropped it (see _client_for)
+        self._leases = 0
+        self._evicted = False
+        # Every endpoint lives on the same host, so a single HTTP/2-capable pool
+        # lets concurrent requests (e.g. crawl polling) share one TLS connection.
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers={
+                "SGAI-APIKEY": api_key,
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=300.0,
+            ),
+        )
+
+    async def __aenter__(self) -> "ScapeGraphClient":
+        return self
 
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
 
-    def markdownify(self, website_url: str) -> Dict[str, Any]:
+    async def _stream_json(
+        self, method: str, url: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a request and parse its JSON body, for endpoints with potentially large responses.
+
+        The body is read through the streaming API so the connection goes back to the
+        pool before parsing starts, and error bodies are never read past a short preview.
+        Transient failures are retried a few times before giving up; which ones depends
+        on the method (see _RETRY_STATUSES) so a POST the API may already have billed
+        is not sent again.
+
+        Raises:
+            ScrapeGraphError: If the API responds with a non-200 status
+        """
+        content = _json_dumps(payload) if payload is not None else None
+        retry_statuses = _RETRY_STATUSES[method]
+        retry_exceptions = _RETRY_EXCEPTIONS[method]
+        for attempt in range(_MAX_ATTEMPTS):
+            final_attempt = attempt == _MAX_ATTEMPTS - 1
+            try:
+                async with self.client.stream(method, url, content=content) as response:
+                    if response.status_code == 200:
+                        body = await response.aread()
+                        break
+                    if response.status_code in retry_statuses and not final_attempt:
+                        delay = _retry_delay(attempt, response.headers.get("retry-after"))
+                    else:
+                        preview = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            preview += chunk
+                            if len(preview) >= _ERROR_PREVIEW_BYTES:
+                                break
+                        raise ScrapeGraphError(
+                            response.status_code,
+                            preview[:_ERROR_PREVIEW_BYTES].decode("utf-8", errors="replace"),
+                        )
+            except retry_exceptions:
+                if final_attempt:
+                    raise
+                delay = _retry_delay(attempt)
+            await asyncio.sleep(delay)
+        return _json_loads(body)
+
+    async def markdownify(self, website_url: str, no_cache: bool = False) -> Dict[str, Any]:
         """
         Convert a webpage into clean, formatted markdown.
 
         Args:
             website_url: URL of the webpage to convert
+            no_cache: Skip the response cache and always call the API
 
         Returns:
             Dictionary containing the markdown result
         """
-        url = f"{self.BASE_URL}/markdownify"
+        _validate_url(website_url, "website_url")
+        url = self._URL_MARKDOWNIFY
         data = {
             "website_url": website_url
         }
 
-        response = self.client.post(url, headers=self.headers, json=data)
-
-        if response.status_code != 200:
-            error_msg = f"Error {response.status_code}: {response.text}"
-            raise Exception(error_msg)
-
-        return response.json()
+        return await _cached_request(
+            (self.api_key, "markdownify", website_url),
+            lambda: self._stream_json("POST", url, data),
+            no_cache=no_cache,
+        )
 
-    def smartscraper(
+    async def smartscraper(
         self,
         user_prompt: str,
         website_url: str = None,
@@ -123,7 +581,8 @@ class ScapeGraphClient:
         number_of_scrolls: int = None,
         total_pages: int = None,
         render_heavy_js: bool = None,
-        stealth: bool = None
+        stealth: bool = None,
+        no_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         Extract structured data from a webpage using AI.
@@ -138,44 +597,107 @@ class ScapeGraphClient:
             total_pages: Number of pages to process for pagination (1-100, default 1)
             render_heavy_js: Enable heavy JavaScript rendering for dynamic pages (default false)
             stealth: Enable stealth mode to avoid bot detection (default false)
+            no_cache: Skip the response cache and always call the API
 
         Returns:
             Dictionary containing the extracted data
         """
-        url = f"{self.BASE_URL}/smartscraper"
-        data = {"user_prompt": user_prompt}
+        url = self._URL_SMARTSCRAPER
 
-        # Add input source (mutually exclusive)
-        if website_url is not None:
-            data["website_url"] = website_url
-        elif website_html is not None:
-            data["website_html"] = website_html
-        elif website_markdown is not None:
-            data["website_markdown"] = website_markdown
-        else:
+        # Input sources are mutually exclusive and exactly one is required
+        sources_given = sum(
+            source is not None for source in (website_url, website_html, website_markdown)
+        )
+        if sources_given == 0:
             raise ValueError("Must provide one of: website_url, website_html, or website_markdown")
-
-        # Add optional parameters
+        if sources_given > 1:
+            raise ValueError(
+                "Cannot specify more than one of: website_url, website_html, or website_markdown"
+            )
+        if website_url is not None:
+            _validate_url(website_url, "website_url")
+        if website_html is not None:
+            _validate_payload_size(website_html, "website_html")
+        if website_markdown is not None:
+            _validate_payload_size(website_markdown, "website_markdown")
+        validator = None
         if output_schema is not None:
-            data["output_schema"] = output_schema
-        if number_of_scrolls is not None:
-            data["number_of_scrolls"] = number_of_scrolls
-        if total_pages is not None:
-            data["total_pages"] = total_pages
-        if render_heavy_js is not None:
-            data["render_heavy_js"] = render_heavy_js
-        if stealth is not None:
-            data["stealth"] = stealth
+            _validate_output_schema(output_schema)
+            validator = _result_validator(output_schema)
+
+        data = {
+            key: value
+            for key, value in (
+                ("user_prompt", user_prompt),
+                ("website_url", website_url),
+                ("website_html", website_html),
+                ("website_markdown", website_markdown),
+                ("output_schema", output_schema),
+                ("number_of_scrolls", number_of_scrolls),
+                ("total_pages", total_pages),
+                ("render_heavy_js", render_heavy_js),
+                ("stealth", stealth),
+            )
+            if value is not None
+        }
+
+        async def fetch() -> Dict[str, Any]:
+            response = await self.client.post(url, content=_json_dumps(data))
+            _raise_for_status(response)
+
+            result = _json_loads(response.content)
+            if validator is not None and isinstance(result, dict):
+                _check_result_against_schema(result, validator)
+            return result
+
+        # Inline HTML/markdown can be up to 2MB; fingerprint it once instead of
+        # serializing the whole body into the cache key.
+        key_payload = data
+        if website_html is not None:
+            key_payload = {**data, "website_html": _content_digest(website_html)}
+        elif website_markdown is not None:
+            key_payload = {**data, "website_markdown": _content_digest(website_markdown)}
 
-        response = self.client.post(url, headers=self.headers, json=data)
+        return await _cached_request(
+            (self.api_key, "smartscraper", _request_digest(key_payload)), fetch, no_cache=no_cache
+        )
 
-        if response.status_code != 200:
-            error_msg = f"Error {response.status_code}: {response.text}"
-            raise Exception(error_msg)
+    async def smartscraper_batch(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several smartscraper requests concurrently over the shared connection pool.
 
-        return response.json()
+        Args:
+            items: smartscraper keyword arguments, one dict per request. output_schema
+                may be a dict or a JSON string, as in the smartscraper tool.
+            concurrency: Maximum number of requests in flight at once (1-50, default 10)
 
-    def searchscraper(self, user_prompt: str, num_results: int = None, number_of_scrolls: int = None) -> Dict[str, Any]:
+        Returns:
+            One result per item, in the same order. A failed request, including one
+            with invalid arguments, is returned as {"error": "..."} so that it does
+            not abort the rest of the batch.
+        """
+        if not 1 <= concurrency <= 50:
+            raise ValueError("concurrency must be between 1 and 50")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(item: Dict[str, Any]) -> Dict[str, Any]:
+            item = {**item, "output_schema": _normalize_output_schema(item.get("output_schema"))}
+            async with semaphore:
+                return await self.smartscraper(**item)
+
+        results = await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+        return [
+            {"error": str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    async def searchscraper(
+        self, user_prompt: str, num_results: int = None, number_of_scrolls: int = None
+    ) -> Dict[str, Any]:
         """
         Perform AI-powered web searches with structured results.
 
@@ -187,28 +709,25 @@ class ScapeGraphClient:
         Returns:
             Dictionary containing search results and reference URLs
         """
-        url = f"{self.BASE_URL}/searchscraper"
+        url = self._URL_SEARCHSCRAPER
         data = {
-            "user_prompt": user_prompt
+            key: value
+            for key, value in (
+                ("user_prompt", user_prompt),
+                ("num_results", num_results),
+                ("number_of_scrolls", number_of_scrolls),
+            )
+            if value is not None
         }
-        
-        # Add num_results to the request if provided
-        if num_results is not None:
-            data["num_results"] = num_results
-            
-        # Add number_of_scrolls to the request if provided
-        if number_of_scrolls is not None:
-            data["number_of_scrolls"] = number_of_scrolls
-
-        response = self.client.post(url, headers=self.headers, json=data)
 
-        if response.status_code != 200:
-            error_msg = f"Error {response.status_code}: {response.text}"
-            raise Exception(error_msg)
+        response = await self.client.post(url, content=_json_dumps(data))
+        _raise_for_status(response)
 
-        return response.json()
+        return _json_loads(response.content)
 
-    def scrape(self, website_url: str, render_heavy_js: Optional[bool] = None) -> Dict[str, Any]:
+    async def scrape(
+        self, website_url: str, render_heavy_js: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Basic scrape endpoint to fetch page content.
 
@@ -219,33 +738,73 @@ class ScapeGraphClient:
         Returns:
             Dictionary containing the scraped result
         """
-        url = f"{self.BASE_URL}/scrape"
-        payload: Dict[str, Any] = {"website_url": website_url}
-        if render_heavy_js is not None:
-            payload["render_heavy_js"] = render_heavy_js
+        _validate_url(website_url, "website_url")
+        url = self._URL_SCRAPE
+        payload: Dict[str, Any] = {
+            key: value
+            for key, value in (
+                ("website_url", website_url),
+                ("render_heavy_js", render_heavy_js),
+            )
+            if value is not None
+        }
 
-        response = self.client.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._stream_json("POST", url, payload)
 
-    def sitemap(self, website_url: str) -> Dict[str, Any]:
+    async def scrape_many(
+        self,
+        urls: List[str],
+        render_heavy_js: Optional[bool] = None,
+        concurrency: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape several URLs concurrently over the shared connection pool.
+
+        Args:
+            urls: URLs to scrape
+            render_heavy_js: Whether to render heavy JS (optional, applies to every URL)
+            concurrency: Maximum number of requests in flight at once (1-50, default 10)
+
+        Returns:
+            One result per URL, in the same order. A failed request is returned as
+            {"error": "..."} so that it does not abort the rest of the batch.
+        """
+        if not 1 <= concurrency <= 50:
+            raise ValueError("concurrency must be between 1 and 50")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(website_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.scrape(website_url, render_heavy_js=render_heavy_js)
+
+        results = await asyncio.gather(*(run_one(url) for url in urls), return_exceptions=True)
+        return [
+            {"error": str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    async def sitemap(self, website_url: str, no_cache: bool = False) -> Dict[str, Any]:
         """
         Extract sitemap for a given website.
 
         Args:
             website_url: Base website URL
+            no_cache: Skip the response cache and always call the API
 
         Returns:
             Dictionary containing sitemap URLs/structure
         """
-        url = f"{self.BASE_URL}/sitemap"
+        _validate_url(website_url, "website_url")
+        url = self._URL_SITEMAP
         payload: Dict[str, Any] = {"website_url": website_url}
 
-        response = self.client.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await _cached_request(
+            (self.api_key, "sitemap", website_url),
+            lambda: self._stream_json("POST", url, payload),
+            no_cache=no_cache,
+        )
 
-    def agentic_scrapper(
+    async def agentic_scrapper(
         self,
         url: str,
         user_prompt: Optional[str] = None,
@@ -267,31 +826,43 @@ class ScapeGraphClient:
             persistent_session: Whether to keep session alive between steps (optional)
             timeout_seconds: Per-request timeout override in seconds (optional)
         """
-        endpoint = f"{self.BASE_URL}/agentic-scrapper"
-        payload: Dict[str, Any] = {"url": url}
-        if user_prompt is not None:
-            payload["user_prompt"] = user_prompt
+        _validate_url(url, "url")
+        endpoint = self._URL_AGENTIC_SCRAPPER
+        validator = None
         if output_schema is not None:
-            payload["output_schema"] = output_schema
-        if steps is not None:
-            payload["steps"] = steps
-        if ai_extraction is not None:
-            payload["ai_extraction"] = ai_extraction
-        if persistent_session is not None:
-            payload["persistent_session"] = persistent_session
-
-        if timeout_seconds is not None:
-            response = self.client.post(endpoint, headers=self.headers, json=payload, timeout=timeout_seconds)
-        else:
-            response = self.client.post(endpoint, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+            _validate_output_schema(output_schema)
+            validator = _result_validator(output_schema)
+
+        payload: Dict[str, Any] = {
+            key: value
+            for key, value in (
+                ("url", url),
+                ("user_prompt", user_prompt),
+                ("output_schema", output_schema),
+                ("steps", steps),
+                ("ai_extraction", ai_extraction),
+                ("persistent_session", persistent_session),
+            )
+            if value is not None
+        }
+
+        response = await self.client.post(
+            endpoint,
+            content=_json_dumps(payload),
+            timeout=timeout_seconds if timeout_seconds is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        _raise_for_status(response)
+
+        result = _json_loads(response.content)
+        if validator is not None and isinstance(result, dict):
+            _check_result_against_schema(result, validator)
+        return result
 
-    def smartcrawler_initiate(
+    async def smartcrawler_initiate(
         self, 
         url: str, 
         prompt: str = None, 
-        extraction_mode: str = "ai",
+        extraction_mode: Literal["ai", "markdown"] = "ai",
         depth: int = None,
         max_pages: int = None,
         same_domain_only: bool = None
@@ -319,36 +890,35 @@ class ScapeGraphClient:
         Returns:
             Dictionary containing the request ID for async processing
         """
-        endpoint = f"{self.BASE_URL}/crawl"
-        data = {
-            "url": url
-        }
-        
+        _validate_url(url, "url")
+        endpoint = self._URL_CRAWL
+
         # Handle extraction mode
-        if extraction_mode == "markdown":
-            data["markdown_only"] = True
-        elif extraction_mode == "ai":
-            if prompt is None:
-                raise ValueError("prompt is required when extraction_mode is 'ai'")
-            data["prompt"] = prompt
-        else:
+        if extraction_mode not in ("ai", "markdown"):
             raise ValueError(f"Invalid extraction_mode: {extraction_mode}. Must be 'ai' or 'markdown'")
-        if depth is not None:
-            data["depth"] = depth
-        if max_pages is not None:
-            data["max_pages"] = max_pages
-        if same_domain_only is not None:
-            data["same_domain_only"] = same_domain_only
+        markdown_only = extraction_mode == "markdown"
+        if not markdown_only and prompt is None:
+            raise ValueError("prompt is required when extraction_mode is 'ai'")
 
-        response = self.client.post(endpoint, headers=self.headers, json=data)
+        data = {
+            key: value
+            for key, value in (
+                ("url", url),
+                ("markdown_only", True if markdown_only else None),
+                ("prompt", None if markdown_only else prompt),
+                ("depth", depth),
+                ("max_pages", max_pages),
+                ("same_domain_only", same_domain_only),
+            )
+            if value is not None
+        }
 
-        if response.status_code != 200:
-            error_msg = f"Error {response.status_code}: {response.text}"
-            raise Exception(error_msg)
+        response = await self.client.post(endpoint, content=_json_dumps(data))
+        _raise_for_status(response)
 
-        return response.json()
+        return _json_loads(response.content)
 
-    def smartcrawler_fetch_results(self, request_id: str) -> Dict[str, Any]:
+    async def smartcrawler_fetch_results(self, request_id: str) -> Dict[str, Any]:
         """
         Fetch the results of a SmartCrawler operation.
 
@@ -366,23 +936,71 @@ class ScapeGraphClient:
         The request is complete when the status is "completed". and you get results
         Keep polling the smartcrawler_fetch_results until the request is complete.
         """
-        endpoint = f"{self.BASE_URL}/crawl/{request_id}"
-        
-        response = self.client.get(endpoint, headers=self.headers)
+        endpoint = self._URL_CRAWL_PREFIX + request_id
+        # Crawl status changes over time so it is never cached, but concurrent
+        # pollers of the same crawl (e.g. smartcrawler_await alongside manual
+        # fetches) can share one request.
+        return await _singleflight(
+            (self.api_key, "crawl", request_id), lambda: self._stream_json("GET", endpoint)
+        )
 
-        if response.status_code != 200:
-            error_msg = f"Error {response.status_code}: {response.text}"
-            raise Exception(error_msg)
+    async def smartcrawler_await(
+        self,
+        request_id: str,
+        initial: float = 1.0,
+        max_interval: float = 15.0,
+        deadline: float = 600.0,
+    ) -> Dict[str, Any]:
+        """
+        Poll a SmartCrawler request until it finishes, backing off between polls.
 
-        return response.json()
+        Args:
+            request_id: The request ID returned by smartcrawler_initiate
+            initial: Delay in seconds before the second poll (default 1.0)
+            max_interval: Upper bound in seconds for the delay between polls (default 15.0)
+            deadline: Maximum total time to wait in seconds (default 600.0, capped at
+                _MAX_AWAIT_SECONDS)
 
-    def close(self) -> None:
+        Returns:
+            The completed (or failed) crawl result, or the last status received
+            if the deadline passed before the request finished
+
+        Raises:
+            ValueError: If a delay or the deadline is not positive, or max_interval
+                is smaller than initial
+        """
+        # "not x > 0" also rejects NaN
+        if not (initial > 0 and max_interval >= initial):
+            raise ValueError("initial_poll must be > 0 and max_poll must be >= initial_poll")
+        if not deadline > 0:
+            raise ValueError("max_wait must be > 0")
+        deadline = min(deadline, _MAX_AWAIT_SECONDS)
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + deadline
+        interval = initial
+
+        while True:
+            result = await self.smartcrawler_fetch_results(request_id)
+            if result.get("status") in _CRAWL_TERMINAL_STATUSES:
+                return result
+
+            remaining = give_up_at - loop.time()
+            if remaining <= 0:
+                return result
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, max_interval)
+
+    async def close(self) -> None:
         """Close the HTTP client."""
-        self.client.close()
+        await self.client.aclose()
 
 
 # Pydantic configuration schema for Smithery
 class ConfigSchema(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     scrapegraph_api_key: Optional[str] = Field(
         default=None,
         description="Your Scrapegraph API key (optional - can also be set via SGAI_API_KEY environment variable)",
@@ -393,13 +1011,26 @@ class ConfigSchema(BaseModel):
     )
 
 
+# Transport selected for this process (see main()), read once at import
+_MCP_TRANSPORT: str = os.getenv("MCP_TRANSPORT", "stdio").lower()
+
+# Process-wide fallback key, read once at import rather than on every tool call.
+# Only honored over stdio: in HTTP mode it would let any remote caller spend the
+# operator's credits, so remote callers must send their own key.
+_ENV_API_KEY: Optional[str] = (
+    os.getenv("SGAI_API_KEY") if _MCP_TRANSPORT != "http" else None
+)
+
+
 def get_api_key(ctx: Context) -> str:
     """
-    Get the API key from HTTP header or MCP session config.
+    Get the API key from HTTP header, MCP session config or environment.
 
-    Supports two modes:
+    Supports three sources, in order:
     - HTTP mode (Render): API key from 'X-API-Key' header via mcp-remote
     - Stdio mode (Smithery): API key from session_config.scrapegraph_api_key
+    - Local stdio runs: API key from the SGAI_API_KEY environment variable
+      (ignored in HTTP mode, where every caller must supply their own key)
 
     Args:
         ctx: FastMCP context
@@ -410,34 +1041,153 @@ def get_api_key(ctx: Context) -> str:
     Raises:
         ValueError: If no API key is found
     """
-    from fastmcp.server.dependencies import get_http_headers
-
-    # Try HTTP header first (for remote/Render deployments)
-    try:
-        headers = get_http_headers()
-        api_key = headers.get('x-api-key')
-        if api_key:
-            logger.info("API key retrieved from X-API-Key header")
-            return api_key
-    except LookupError:
-        # Not in HTTP context, try session config (Smithery/stdio mode)
-        pass
+    # Try HTTP header first (for remote/Render deployments). Outside an HTTP
+    # request get_http_headers() returns an empty dict rather than raising.
+    api_key = get_http_headers().get('x-api-key')
+    if api_key:
+        return api_key
 
     # Try session config (for Smithery/stdio deployments)
-    if hasattr(ctx, 'session_config') and ctx.session_config is not None:
-        api_key = getattr(ctx.session_config, 'scrapegraph_api_key', None)
+    session_config = getattr(ctx, 'session_config', None)
+    if session_config is not None:
+        api_key = getattr(session_config, 'scrapegraph_api_key', None)
         if api_key:
-            logger.info("API key retrieved from session config")
             return api_key
 
-    logger.error("No API key found in header or session config")
+    if _ENV_API_KEY:
+        return _ENV_API_KEY
+
+    if _MCP_TRANSPORT == "http":
+        logger.error("No API key found in header or session config")
+        raise ValueError(
+            "ScapeGraph API key is required. Please provide it via:\n"
+            "- HTTP header 'X-API-Key' (for remote server via mcp-remote)\n"
+            "- MCP config 'scrapegraphApiKey'"
+        )
+    logger.error("No API key found in header, session config or environment")
     raise ValueError(
         "ScapeGraph API key is required. Please provide it via:\n"
         "- HTTP header 'X-API-Key' (for remote server via mcp-remote)\n"
-        "- MCP config 'scrapegraphApiKey' (for Smithery/local stdio)"
+        "- MCP config 'scrapegraphApiKey' (for Smithery/local stdio)\n"
+        "- Environment variable 'SGAI_API_KEY'"
     )
 
 
+@functools.lru_cache(maxsize=512)
+def _parse_output_schema_str(output_schema: str) -> Dict[str, Any]:
+    """
+    Parse and normalize a JSON-string schema, caching by the raw string.
+
+    Agents tend to resend the same schema string on every call, so repeats
+    skip parsing entirely. Callers must treat the result as read-only.
+    """
+    # Anything not starting with '{' cannot be an object; skip the parse.
+    if not output_schema.lstrip().startswith("{"):
+        raise ValueError("output_schema must be a JSON object")
+    try:
+        parsed_schema = _json_loads(output_schema)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON for output_schema: {str(e)}") from e
+    if not isinstance(parsed_schema, dict):
+        raise ValueError("output_schema must be a JSON object")
+    parsed_schema.setdefault("required", [])
+    return parsed_schema
+
+
+def _project_fields(result: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested top-level keys of a response (all of them if fields is None)."""
+    if fields is None:
+        return result
+    return {key: result[key] for key in fields if key in result}
+
+
+def _normalize_output_schema(
+    output_schema: Optional[Union[str, Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Normalize an output schema given as a dict or JSON string.
+
+    Parses JSON strings and ensures the schema has a 'required' field, which
+    the API expects (an empty list is added when it is missing).
+
+    Args:
+        output_schema: Schema as a dict, JSON string, or None
+
+    Returns:
+        The normalized schema dict, or None if no schema was given
+
+    Raises:
+        ValueError: If a string schema is not valid JSON or not a JSON object
+    """
+    if output_schema is None:
+        return None
+    if isinstance(output_schema, str):
+        return _parse_output_schema_str(output_schema)
+
+    # Ensure output_schema has a 'required' field if it exists
+    if isinstance(output_schema, dict):
+        output_schema.setdefault("required", [])
+        return output_schema
+
+    return None
+
+
+# Upper bound on cached clients. In HTTP mode callers choose the X-API-Key,
+# so an unbounded map would let arbitrary keys pile up connection pools.
+_MAX_CLIENTS = 256
+
+# Close tasks for evicted clients, held so they are not garbage collected
+_CLOSING: set = set()
+
+
+class _ClientCache(LRUCache):
+    """LRU cache of shared clients that closes clients as they are evicted."""
+
+    def popitem(self) -> Tuple[str, ScapeGraphClient]:
+        key, client = super().popitem()
+        client._evicted = True
+        if client._leases == 0:
+            task = asyncio.get_running_loop().create_task(client.close())
+            _CLOSING.add(task)
+            task.add_done_callback(_CLOSING.discard)
+        return key, client
+
+
+# One client (and HTTP/2 connection pool) per API key, shared by every tool
+# call so warm calls skip TCP and TLS setup.
+_CLIENTS: _ClientCache = _ClientCache(maxsize=_MAX_CLIENTS)
+
+
+@contextlib.asynccontextmanager
+async def _client_for(api_key: str) -> AsyncIterator[ScapeGraphClient]:
+    """
+    Lease the shared client for an API key, creating it on first use.
+
+    A client evicted from the cache while leased stays open until its last
+    lease is released, so in-flight calls are never cut off.
+    """
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        client = _CLIENTS[api_key] = ScapeGraphClient(api_key)
+    client._leases += 1
+    try:
+        yield client
+    finally:
+        client._leases -= 1
+        if client._evicted and client._leases == 0:
+            await client.close()
+
+
+async def _close_clients() -> None:
+    """Close every shared client; called once when the transport stops."""
+    clients = list(_CLIENTS.values())
+    # Delete keys directly; clear() would go through popitem() and schedule
+    # a second close for each client.
+    for api_key in list(_CLIENTS):
+        del _CLIENTS[api_key]
+    await asyncio.gather(*(client.close() for client in clients), *_CLOSING)
+
+
 # Create MCP server instance
 mcp = FastMCP("ScapeGraph API MCP Server")
 
@@ -450,15 +1200,10 @@ async def health_check(request):
     return JSONResponse({"status": "healthy", "service": "scrapegraph-mcp"})
 
 
-# Add prompts to help users interact with the server
-@mcp.prompt()
-def web_scraping_guide() -> str:
-    """
-    A comprehensive guide to using ScapeGraph's web scraping tools effectively.
-    
-    This prompt provides examples and best practices for each tool in the ScapeGraph MCP server.
-    """
-    return """# ScapeGraph Web Scraping Guide
+# Static bodies of the prompts and resources below, built once at import so
+# each handler returns the same string object instead of a fresh literal.
+_GUIDES: Dict[str, str] = {
+    "web_scraping_guide": """# ScapeGraph Web Scraping Guide
 
 ## Available Tools Overview
 
@@ -530,17 +1275,8 @@ def web_scraping_guide() -> str:
 ### Complex Navigation
 1. Use `agentic_scrapper` for sites requiring interaction
 2. Provide step-by-step instructions in the `steps` parameter
-"""
-
-
-@mcp.prompt()
-def quick_start_examples() -> str:
-    """
-    Quick start examples for common ScapeGraph use cases.
-    
-    Ready-to-use examples for immediate productivity.
-    """
-    return """# ScapeGraph Quick Start Examples
+""",
+    "quick_start_examples": """# ScapeGraph Quick Start Examples
 
 ## 🚀 Ready-to-Use Examples
 
@@ -609,18 +1345,8 @@ Set your API key via:
 - MCP configuration: `scrapegraph_api_key: "your_key_here"`
 
 No configuration required - the server works with environment variables!
-"""
-
-
-# Add resources to expose server capabilities and data
-@mcp.resource("scrapegraph://api/status")
-def api_status() -> str:
-    """
-    Current status and capabilities of the ScapeGraph API server.
-    
-    Provides real-time information about available tools, credit usage, and server health.
-    """
-    return """# ScapeGraph API Status
+""",
+    "api_status": """# ScapeGraph API Status
 
 ## Server Information
 - **Status**: ✅ Online and Ready
@@ -653,19 +1379,8 @@ def api_status() -> str:
 - Use AI mode for structured data extraction
 - Set appropriate limits for crawling operations
 - Monitor credit usage for cost optimization
-
-Last Updated: $(date)
-"""
-
-
-@mcp.resource("scrapegraph://examples/use-cases")
-def common_use_cases() -> str:
-    """
-    Common use cases and example implementations for ScapeGraph tools.
-    
-    Real-world examples with expected inputs and outputs.
-    """
-    return """# ScapeGraph Common Use Cases
+""",
+    "common_use_cases": """# ScapeGraph Common Use Cases
 
 ## 🛍️ E-commerce Data Extraction
 
@@ -761,17 +1476,8 @@ def common_use_cases() -> str:
 - Not polling async operations (missing results)
 - Ignoring rate limits (request failures)
 - Not handling JavaScript-heavy sites (incomplete data)
-"""
-
-
-@mcp.resource("scrapegraph://parameters/reference")
-def parameter_reference_guide() -> str:
-    """
-    Comprehensive parameter reference guide for all ScapeGraph MCP tools.
-    
-    Complete documentation of every parameter with examples, constraints, and best practices.
-    """
-    return """# ScapeGraph MCP Parameter Reference Guide
+""",
+    "parameter_reference_guide": """# ScapeGraph MCP Parameter Reference Guide
 
 ## 📋 Complete Parameter Documentation
 
@@ -1200,17 +1906,8 @@ Parameters: steps, persistent_session, timeout_seconds
 
 *Last Updated: November 2024*
 *For the most current parameter information, refer to individual tool documentation.*
-"""
-
-
-@mcp.resource("scrapegraph://tools/comparison")
-def tool_comparison_guide() -> str:
-    """
-    Detailed comparison of ScapeGraph tools to help choose the right tool for each task.
-    
-    Decision matrix and feature comparison across all available tools.
-    """
-    return """# ScapeGraph Tools Comparison Guide
+""",
+    "tool_comparison_guide": """# ScapeGraph Tools Comparison Guide
 
 ## 🎯 Quick Decision Matrix
 
@@ -1348,12 +2045,77 @@ URL → sitemap (map structure) → smartcrawler (batch process)
 - ✅ Site requires complex navigation
 - ✅ Need to interact with forms/buttons
 - ✅ Custom workflow requirements
-"""
+""",
+}
+
+
+# Add prompts to help users interact with the server
+@mcp.prompt()
+def web_scraping_guide() -> str:
+    """
+    A comprehensive guide to using ScapeGraph's web scraping tools effectively.
+    
+    This prompt provides examples and best practices for each tool in the ScapeGraph MCP server.
+    """
+    return _GUIDES["web_scraping_guide"]
+
+
+@mcp.prompt()
+def quick_start_examples() -> str:
+    """
+    Quick start examples for common ScapeGraph use cases.
+    
+    Ready-to-use examples for immediate productivity.
+    """
+    return _GUIDES["quick_start_examples"]
+
+
+# Add resources to expose server capabilities and data
+@mcp.resource("scrapegraph://api/status")
+def api_status() -> str:
+    """
+    Current status and capabilities of the ScapeGraph API server.
+    
+    Provides real-time information about available tools, credit usage, and server health.
+    """
+    return f"{_GUIDES['api_status']}\nLast Updated: {datetime.now(timezone.utc).isoformat()}\n"
+
+
+@mcp.resource("scrapegraph://examples/use-cases")
+def common_use_cases() -> str:
+    """
+    Common use cases and example implementations for ScapeGraph tools.
+    
+    Real-world examples with expected inputs and outputs.
+    """
+    return _GUIDES["common_use_cases"]
+
+
+@mcp.resource("scrapegraph://parameters/reference")
+def parameter_reference_guide() -> str:
+    """
+    Comprehensive parameter reference guide for all ScapeGraph MCP tools.
+    
+    Complete documentation of every parameter with examples, constraints, and best practices.
+    """
+    return _GUIDES["parameter_reference_guide"]
+
+
+@mcp.resource("scrapegraph://tools/comparison")
+def tool_comparison_guide() -> str:
+    """
+    Detailed comparison of ScapeGraph tools to help choose the right tool for each task.
+    
+    Decision matrix and feature comparison across all available tools.
+    """
+    return _GUIDES["tool_comparison_guide"]
 
 
 # Add tool for markdownify
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
-def markdownify(website_url: str, ctx: Context) -> Dict[str, Any]:
+async def markdownify(
+    website_url: str, ctx: Context, no_cache: bool = False
+) -> Dict[str, Any]:
     """
     Convert a webpage into clean, formatted markdown.
 
@@ -1375,6 +2137,10 @@ def markdownify(website_url: str, ctx: Context) -> Dict[str, Any]:
               * ftp://example.com (unsupported protocol)
               * localhost:3000 (missing protocol)
 
+        no_cache (bool): Bypass the short-lived response cache. Default: False
+            - Identical requests within 5 minutes are served from memory
+            - Set to True to force a fresh conversion
+
     Returns:
         Dictionary containing:
         - markdown: The converted markdown content as a string
@@ -1389,15 +2155,15 @@ def markdownify(website_url: str, ctx: Context) -> Dict[str, Any]:
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.markdownify(website_url)
-    except Exception as e:
+        async with _client_for(api_key) as client:
+            return await client.markdownify(website_url, no_cache=no_cache)
+    except _TOOL_ERRORS as e:
         return {"error": str(e)}
 
 
 # Add tool for smartscraper
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
-def smartscraper(
+async def smartscraper(
     user_prompt: str,
     ctx: Context,
     website_url: Optional[str] = None,
@@ -1416,7 +2182,8 @@ def smartscraper(
     number_of_scrolls: Optional[int] = None,
     total_pages: Optional[int] = None,
     render_heavy_js: Optional[bool] = None,
-    stealth: Optional[bool] = None
+    stealth: Optional[bool] = None,
+    no_cache: bool = False
 ) -> Dict[str, Any]:
     """
     Extract structured data from a webpage, HTML, or markdown using AI-powered extraction.
@@ -1523,6 +2290,11 @@ def smartscraper(
               * Sites that require "human-like" behavior
             - Note: May increase processing time and is not 100% guaranteed
 
+        no_cache (bool): Bypass the short-lived response cache. Default: False
+            - Identical requests (same source, prompt, schema and options) within
+              5 minutes are served from memory without using credits
+            - Set to True to force a fresh extraction
+
     Returns:
         Dictionary containing:
         - extracted_data: The structured data matching your prompt and optional schema
@@ -1531,6 +2303,8 @@ def smartscraper(
         - processing_time: Time taken for the extraction
         - pages_processed: Number of pages that were analyzed
         - status: Success/error status of the operation
+        - schema_validation_error: Present only when output_schema was given and the
+          extracted result does not conform to it (the data is still returned)
 
     Raises:
         ValueError: If no input source provided or multiple sources provided
@@ -1540,45 +2314,76 @@ def smartscraper(
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
 
-        # Parse output_schema if it's a JSON string
-        normalized_schema: Optional[Dict[str, Any]] = None
-        if isinstance(output_schema, dict):
-            normalized_schema = output_schema
-        elif isinstance(output_schema, str):
-            try:
-                parsed_schema = json.loads(output_schema)
-                if isinstance(parsed_schema, dict):
-                    normalized_schema = parsed_schema
-                else:
-                    return {"error": "output_schema must be a JSON object"}
-            except json.JSONDecodeError as e:
-                return {"error": f"Invalid JSON for output_schema: {str(e)}"}
-
-        # Ensure output_schema has a 'required' field if it exists
-        if normalized_schema is not None:
-            if "required" not in normalized_schema:
-                normalized_schema["required"] = []
-
-        return client.smartscraper(
-            user_prompt=user_prompt,
-            website_url=website_url,
-            website_html=website_html,
-            website_markdown=website_markdown,
-            output_schema=normalized_schema,
-            number_of_scrolls=number_of_scrolls,
-            total_pages=total_pages,
-            render_heavy_js=render_heavy_js,
-            stealth=stealth
-        )
-    except Exception as e:
+        normalized_schema = _normalize_output_schema(output_schema)
+
+        async with _client_for(api_key) as client:
+            return await client.smartscraper(
+                user_prompt=user_prompt,
+                website_url=website_url,
+                website_html=website_html,
+                website_markdown=website_markdown,
+                output_schema=normalized_schema,
+                number_of_scrolls=number_of_scrolls,
+                total_pages=total_pages,
+                render_heavy_js=render_heavy_js,
+                stealth=stealth,
+                no_cache=no_cache
+            )
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
+
+
+# Add tool for batched smartscraper requests
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
+async def smartscraper_batch(
+    requests: List[Dict[str, Any]],
+    ctx: Context,
+    concurrency: int = 10
+) -> Dict[str, Any]:
+    """
+    Run several smartscraper extractions concurrently and return all results together.
+
+    Use this instead of calling smartscraper repeatedly when you need to extract data from
+    several pages (e.g. the result pages of a searchscraper call). Requests run in parallel
+    (up to `concurrency` at a time), so the batch takes roughly
+    ceil(len(requests) / concurrency) times as long as a single extraction.
+    Costs the same as the equivalent individual smartscraper calls. Read-only operation.
+
+    Args:
+        requests (List[Dict]): One object per extraction, using the smartscraper parameters.
+            - Each object must contain user_prompt and exactly one of website_url,
+              website_html or website_markdown
+            - Optional keys: output_schema, number_of_scrolls, total_pages,
+              render_heavy_js, stealth (same meaning as in smartscraper)
+            - Example:
+              [
+                {"user_prompt": "Extract the product name and price",
+                 "website_url": "https://example.com/a"},
+                {"user_prompt": "Extract the product name and price",
+                 "website_url": "https://example.com/b"}
+              ]
+
+        concurrency (int): Maximum number of requests in flight at once.
+            - Default: 10
+            - Range: 1-50
+
+    Returns:
+        Dictionary containing:
+        - results: One entry per request, in the same order. Each entry is the smartscraper
+          response, or {"error": "..."} if that particular request failed.
+    """
+    try:
+        api_key = get_api_key(ctx)
+        async with _client_for(api_key) as client:
+            return {"results": await client.smartscraper_batch(requests, concurrency=concurrency)}
+    except _TOOL_ERRORS as e:
         return {"error": str(e)}
 
 
 # Add tool for searchscraper
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": False})
-def searchscraper(
+async def searchscraper(
     user_prompt: str,
     ctx: Context,
     num_results: Optional[int] = None,
@@ -1655,19 +2460,19 @@ def searchscraper(
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.searchscraper(user_prompt, num_results, number_of_scrolls)
-    except Exception as e:
+        async with _client_for(api_key) as client:
+            return await client.searchscraper(user_prompt, num_results, number_of_scrolls)
+    except _TOOL_ERRORS as e:
         return {"error": str(e)}
 
 
 # Add tool for SmartCrawler initiation
 @mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": False, "idempotentHint": False})
-def smartcrawler_initiate(
+async def smartcrawler_initiate(
     url: str,
     ctx: Context,
     prompt: Optional[str] = None,
-    extraction_mode: str = "ai",
+    extraction_mode: Literal["ai", "markdown"] = "ai",
     depth: Optional[int] = None,
     max_pages: Optional[int] = None,
     same_domain_only: Optional[bool] = None
@@ -1714,7 +2519,7 @@ def smartcrawler_initiate(
               * Consider that different pages may have different content structures
               * Use general terms that apply across multiple page types
 
-        extraction_mode (str): Extraction mode for processing crawled pages.
+        extraction_mode (Literal["ai", "markdown"]): Extraction mode for processing crawled pages.
             - Default: "ai"
             - Options:
               * "ai": AI-powered structured data extraction (10 credits per page)
@@ -1804,22 +2609,26 @@ def smartcrawler_initiate(
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.smartcrawler_initiate(
-            url=url,
-            prompt=prompt,
-            extraction_mode=extraction_mode,
-            depth=depth,
-            max_pages=max_pages,
-            same_domain_only=same_domain_only
-        )
-    except Exception as e:
+        async with _client_for(api_key) as client:
+            return await client.smartcrawler_initiate(
+                url=url,
+                prompt=prompt,
+                extraction_mode=extraction_mode,
+                depth=depth,
+                max_pages=max_pages,
+                same_domain_only=same_domain_only
+            )
+    except _TOOL_ERRORS as e:
         return {"error": str(e)}
 
 
 # Add tool for fetching SmartCrawler results
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
-def smartcrawler_fetch_results(request_id: str, ctx: Context) -> Dict[str, Any]:
+async def smartcrawler_fetch_results(
+    request_id: str,
+    ctx: Context,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Retrieve the results of an asynchronous SmartCrawler operation.
 
@@ -1829,7 +2638,11 @@ def smartcrawler_fetch_results(request_id: str, ctx: Context) -> Dict[str, Any]:
     Read-only operation that safely retrieves results without side effects.
 
     Args:
-        request_id: The unique request ID returned by smartcrawler_initiate. Use this to retrieve the crawling results. Keep polling until status is 'completed'. Example: 'req_abc123xyz'
+        request_id: The unique request ID returned by smartcrawler_initiate. Use this to retrieve
+            the crawling results. Keep polling until status is 'completed'.
+            Example: 'req_abc123xyz'
+        fields: Top-level response keys to return (default: all). Example: ["status"] to check
+            progress without receiving the crawled pages.
 
     Returns:
         Dictionary containing:
@@ -1840,15 +2653,59 @@ def smartcrawler_fetch_results(request_id: str, ctx: Context) -> Dict[str, Any]:
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.smartcrawler_fetch_results(request_id)
-    except Exception as e:
+        async with _client_for(api_key) as client:
+            return _project_fields(await client.smartcrawler_fetch_results(request_id), fields)
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
+
+
+# Add tool for waiting on SmartCrawler results
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
+async def smartcrawler_await(
+    request_id: str,
+    ctx: Context,
+    max_wait: float = 600.0,
+    initial_poll: float = 1.0,
+    max_poll: float = 15.0
+) -> Dict[str, Any]:
+    """
+    Wait for an asynchronous SmartCrawler operation to finish and return its results.
+
+    This tool polls the crawl request on the server side with exponential backoff (starting at
+    1 second, capped at 15 seconds between polls by default) and returns once the status is
+    'completed' or 'failed'.
+    Use it instead of calling smartcrawler_fetch_results in a loop: a single call replaces the
+    whole polling sequence. Read-only operation that safely retrieves results without side effects.
+
+    Args:
+        request_id: The unique request ID returned by smartcrawler_initiate.
+            Example: 'req_abc123xyz'
+        max_wait: Maximum number of seconds to wait for completion (default 600, must be > 0,
+            capped at 1800). If the crawl is still running when this elapses, the latest status
+            is returned and you can call this tool again with the same request_id.
+        initial_poll: Seconds to wait before the second poll (default 1.0, must be > 0)
+        max_poll: Upper bound in seconds for the delay between polls (default 15.0, must be
+            >= initial_poll)
+
+    Returns:
+        Dictionary containing:
+        - status: 'completed' or 'failed' when the crawl finished, otherwise the latest status seen
+        - results: Crawled data (structured extraction or markdown) when completed
+        - metadata: Information about processed pages, URLs visited, and processing statistics
+    """
+    try:
+        api_key = get_api_key(ctx)
+        async with _client_for(api_key) as client:
+            return await client.smartcrawler_await(
+                request_id, initial=initial_poll, max_interval=max_poll, deadline=max_wait
+            )
+    except _TOOL_ERRORS as e:
         return {"error": str(e)}
 
 
 # Add tool for basic scrape
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
-def scrape(
+async def scrape(
     website_url: str,
     ctx: Context,
     render_heavy_js: Optional[bool] = None
@@ -1928,17 +2785,65 @@ def scrape(
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.scrape(website_url=website_url, render_heavy_js=render_heavy_js)
-    except httpx.HTTPError as http_err:
-        return {"error": str(http_err)}
-    except ValueError as val_err:
-        return {"error": str(val_err)}
+        async with _client_for(api_key) as client:
+            return await client.scrape(website_url=website_url, render_heavy_js=render_heavy_js)
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
+
+
+# Add tool for batched basic scrapes
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
+async def scrape_many(
+    urls: List[str],
+    ctx: Context,
+    render_heavy_js: Optional[bool] = None,
+    concurrency: int = 10
+) -> Dict[str, Any]:
+    """
+    Fetch raw content for several URLs concurrently and return all results together.
+
+    Use this instead of calling scrape repeatedly, e.g. to fetch the pages discovered by
+    sitemap. Requests run in parallel (up to `concurrency` at a time), so the batch takes
+    roughly ceil(len(urls) / concurrency) times as long as a single scrape.
+    Costs the same as the equivalent individual scrape calls. Read-only operation.
+
+    Args:
+        urls (List[str]): URLs to fetch.
+            - Each must include protocol (http:// or https://)
+            - Example: ["https://example.com/a", "https://example.com/b"]
+
+        render_heavy_js (Optional[bool]): Enable full JavaScript rendering for every URL.
+            - Default: false (same meaning as in scrape)
+
+        concurrency (int): Maximum number of requests in flight at once.
+            - Default: 10
+            - Range: 1-50
+
+    Returns:
+        Dictionary containing:
+        - results: One entry per URL, in the same order. Each entry is the scrape response,
+          or {"error": "..."} if that particular URL failed.
+    """
+    try:
+        api_key = get_api_key(ctx)
+        async with _client_for(api_key) as client:
+            return {
+                "results": await client.scrape_many(
+                    urls, render_heavy_js=render_heavy_js, concurrency=concurrency
+                )
+            }
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
 
 
 # Add tool for sitemap extraction
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True})
-def sitemap(website_url: str, ctx: Context) -> Dict[str, Any]:
+async def sitemap(
+    website_url: str,
+    ctx: Context,
+    no_cache: bool = False,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Extract and discover the complete sitemap structure of any website.
 
@@ -1967,6 +2872,13 @@ def sitemap(website_url: str, ctx: Context) -> Dict[str, Any]:
               * Discovers pages through internal link analysis
               * Identifies common URL patterns and structures
 
+        no_cache (bool): Bypass the short-lived response cache. Default: False
+            - Identical requests within 5 minutes are served from memory
+            - Set to True to force a fresh discovery
+
+        fields (Optional[List[str]]): Top-level response keys to return. Default: all
+            - Example: ["discovered_urls", "total_pages"] to skip the structure analysis
+
     Returns:
         Dictionary containing:
         - discovered_urls: List of all URLs found on the website
@@ -2011,17 +2923,16 @@ def sitemap(website_url: str, ctx: Context) -> Dict[str, Any]:
     """
     try:
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.sitemap(website_url=website_url)
-    except httpx.HTTPError as http_err:
-        return {"error": str(http_err)}
-    except ValueError as val_err:
-        return {"error": str(val_err)}
+        async with _client_for(api_key) as client:
+            result = await client.sitemap(website_url=website_url, no_cache=no_cache)
+            return _project_fields(result, fields)
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
 
 
 # Add tool for Agentic Scraper (no live session/browser interaction)
 @mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": False, "idempotentHint": False})
-def agentic_scrapper(
+async def agentic_scrapper(
     url: str,
     ctx: Context,
     user_prompt: Optional[str] = None,
@@ -2223,51 +3134,35 @@ def agentic_scrapper(
         normalized_steps = steps
     elif isinstance(steps, str):
         parsed_steps: Optional[Any] = None
-        try:
-            parsed_steps = json.loads(steps)
-        except json.JSONDecodeError:
-            parsed_steps = None
+        # Only a JSON array can become a list of steps; plain instructions such as
+        # "click login" skip the parse (and its guaranteed failure) entirely.
+        if steps.lstrip().startswith("["):
+            try:
+                parsed_steps = _json_loads(steps)
+            except json.JSONDecodeError:
+                parsed_steps = None
         if isinstance(parsed_steps, list):
             normalized_steps = parsed_steps
         else:
             normalized_steps = [steps]
 
-    normalized_schema: Optional[Dict[str, Any]] = None
-    if isinstance(output_schema, dict):
-        normalized_schema = output_schema
-    elif isinstance(output_schema, str):
-        try:
-            parsed_schema = json.loads(output_schema)
-            if isinstance(parsed_schema, dict):
-                normalized_schema = parsed_schema
-            else:
-                return {"error": "output_schema must be a JSON object"}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON for output_schema: {str(e)}"}
-
-    # Ensure output_schema has a 'required' field if it exists
-    if normalized_schema is not None:
-        if "required" not in normalized_schema:
-            normalized_schema["required"] = []
-
     try:
+        normalized_schema = _normalize_output_schema(output_schema)
         api_key = get_api_key(ctx)
-        client = ScapeGraphClient(api_key)
-        return client.agentic_scrapper(
-            url=url,
-            user_prompt=user_prompt,
-            output_schema=normalized_schema,
-            steps=normalized_steps,
-            ai_extraction=ai_extraction,
-            persistent_session=persistent_session,
-            timeout_seconds=timeout_seconds,
-        )
+        async with _client_for(api_key) as client:
+            return await client.agentic_scrapper(
+                url=url,
+                user_prompt=user_prompt,
+                output_schema=normalized_schema,
+                steps=normalized_steps,
+                ai_extraction=ai_extraction,
+                persistent_session=persistent_session,
+                timeout_seconds=timeout_seconds,
+            )
     except httpx.TimeoutException as timeout_err:
-        return {"error": f"Request timed out: {str(timeout_err)}"}
-    except httpx.HTTPError as http_err:
-        return {"error": str(http_err)}
-    except ValueError as val_err:
-        return {"error": str(val_err)}
+        return {"error": f"Request timed out: {timeout_err}"}
+    except _TOOL_ERRORS as e:
+        return {"error": str(e)}
 
 
 # Smithery server creation function
@@ -2282,6 +3177,97 @@ def create_server() -> FastMCP:
     return mcp
 
 
+# HTTP settings, read once at import like _MCP_TRANSPORT. PORT is kept as a
+# string here so a bad value fails in main() rather than on import.
+_MCP_HOST: str = os.getenv("HOST", "0.0.0.0")
+_MCP_PORT: str = os.getenv("PORT", "8000")
+_MCP_MAX_CONCURRENCY: str = os.getenv("MCP_MAX_CONCURRENCY", "64")
+
+
+class _ConcurrencyLimitMiddleware:
+    """
+    ASGI middleware that caps concurrent POST requests in HTTP mode.
+
+    Tool calls arrive as POSTs; requests over the limit are rejected with 429
+    instead of queueing behind in-flight scrapes. Long-lived GET streams and
+    the health check are not counted.
+    """
+
+    def __init__(self, app: ASGIApp, limit: int) -> None:
+        self.app = app
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+        if self._semaphore.locked():
+            from starlette.responses import JSONResponse
+            response = JSONResponse(
+                {"error": "Too many concurrent requests"},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        async with self._semaphore:
+            await self.app(scope, receive, send)
+
+
+async def _serve(transport: Literal["stdio", "http"], **transport_kwargs: Any) -> None:
+    """
+    Run the server on a transport and close the shared clients when it stops.
+
+    FastMCP enters its lifespan once per session in HTTP mode, so client
+    shutdown is tied to the transport here rather than to that lifespan.
+    """
+    try:
+        await mcp.run_async(transport=transport, **transport_kwargs)
+    finally:
+        await _close_clients()
+
+
+def _run_http() -> None:
+    """Serve over streamable HTTP for remote deployment (Render, Koyeb, etc.)."""
+    host = _MCP_HOST
+    port = int(_MCP_PORT)
+    max_concurrency = int(_MCP_MAX_CONCURRENCY)
+    middleware = []
+    if max_concurrency > 0:
+        from starlette.middleware import Middleware
+        middleware.append(Middleware(_ConcurrencyLimitMiddleware, limit=max_concurrency))
+    if os.getenv("SGAI_API_KEY"):
+        logger.warning("SGAI_API_KEY is ignored in HTTP mode; callers must send X-API-Key")
+    logger.info(f"Starting ScapeGraph MCP server in HTTP mode on {host}:{port}")
+    print(f"Starting ScapeGraph MCP server in HTTP mode on {host}:{port}", file=sys.stderr)
+    serve = _serve("http", host=host, port=port, middleware=middleware)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(serve)
+    else:
+        # libuv-backed event loop from the speedups extra
+        uvloop.run(serve)
+
+
+def _run_stdio() -> None:
+    """Serve over stdio for local clients (Claude Desktop, Cursor, etc.)."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Starting ScapeGraph MCP server from local codebase: %s",
+            os.path.abspath(__file__),
+        )
+    print("Starting ScapeGraph MCP server (local codebase)", file=sys.stderr)
+    asyncio.run(_serve("stdio"))
+
+
+# Transport runners keyed by MCP_TRANSPORT; unknown values fall back to stdio.
+_TRANSPORTS: Dict[str, Callable[[], None]] = {
+    "http": _run_http,
+    "stdio": _run_stdio,
+}
+
+
 def main() -> None:
     """Run the ScapeGraph MCP server.
 
@@ -2290,26 +3276,14 @@ def main() -> None:
     - http: For remote deployment on Render, Koyeb, etc.
 
     Set MCP_TRANSPORT=http environment variable for remote deployment.
+    In HTTP mode, MCP_MAX_CONCURRENCY caps concurrent requests (default 64,
+    0 disables the limit).
     """
-    transport = os.getenv("MCP_TRANSPORT", "stdio").lower()
-
     try:
-        if transport == "http":
-            # Remote deployment mode (Render, Koyeb, etc.)
-            host = os.getenv("HOST", "0.0.0.0")
-            port = int(os.getenv("PORT", "8000"))
-            logger.info(f"Starting ScapeGraph MCP server in HTTP mode on {host}:{port}")
-            print(f"Starting ScapeGraph MCP server in HTTP mode on {host}:{port}")
-            mcp.run(transport="http", host=host, port=port)
-        else:
-            # Local stdio mode (Claude Desktop, Cursor, etc.)
-            server_path = os.path.abspath(__file__)
-            logger.info(f"Starting ScapeGraph MCP server from local codebase: {server_path}")
-            print("Starting ScapeGraph MCP server (local codebase)")
-            mcp.run(transport="stdio")
+        _TRANSPORTS.get(_MCP_TRANSPORT, _run_stdio)()
     except Exception as e:
         logger.error(f"Failed to start MCP server: {e}")
-        print(f"Error starting server: {e}")
+        print(f"Error starting server: {e}", file=sys.stderr)
         raise
 
 